@@ -59,9 +59,10 @@ def check_numatune_xml(params):
     mode = params.get("numa_mode", "")
     nodeset = params.get("numa_nodeset", "")
 
-    virt_xml_obj = libvirt_xml.VMXML(virsh_instance=virsh)
+    virt_xml_obj = libvirt_xml.VMXML.new_from_dumpxml(vm_name,
+                                                      virsh_instance=virsh)
 
-    numa_params = virt_xml_obj.get_numa_params(vm_name)
+    numa_params = virt_xml_obj.get_numa_params()
     if not numa_params:
         logging.error("Could not get numa parameters for %s" % vm_name)
         return False
@@ -2,6 +2,37 @@ import logging, re
 from autotest.client.shared import error
 from virttest import utils_misc, utils_net
 
+
+def _get_nic_attrs(session, mac, attrs, timeout=240):
+    """
+    Get several windows nic attributes with a single wmic query.
+
+    Miniport instances may share the mac of the physical nic, only the
+    instance with a netconnectionid is used.
+
+    @param session: session to the virtual machine
+    @param mac: mac address of the nic
+    @param attrs: list of nic attribute names to get
+    @return: dict mapping lower case attribute names to their values
+    """
+    attrs = list(attrs)
+    if "netconnectionid" not in attrs:
+        attrs.append("netconnectionid")
+    cmd = "wmic nic where \"macaddress='%s'\" get %s /format:list"
+    o = session.cmd(cmd % (mac, ",".join(attrs)), timeout=timeout)
+    # Each matching instance is a block of key=value lines
+    nic_attrs = {}
+    for line in o.splitlines() + [""]:
+        key, sep, value = line.strip().partition("=")
+        if sep:
+            nic_attrs[key.lower()] = value
+        elif nic_attrs:
+            if nic_attrs.get("netconnectionid"):
+                return nic_attrs
+            nic_attrs = {}
+    raise error.TestError("Get guest nic attributes %s failed!" % attrs)
+
+
 @error.context_aware
 def run_mac_change(test, params, env):
     """
@@ -18,40 +49,36 @@ def run_mac_change(test, params, env):
     vm = env.get_vm(params["main_vm"])
     vm.verify_alive()
     timeout = int(params.get("login_timeout", 360))
+    os_type = params.get("os_type")
+    change_cmd_pattern = params.get("change_cmd")
+    if os_type == "windows":
+        clean_cmd_pattern = params.get("clean_cmd")
     session_serial = vm.wait_for_serial_login(timeout=timeout)
-    # This session will be used to assess whether the IP change worked
-    session = vm.wait_for_login(timeout=timeout)
     old_mac = vm.get_mac_address(0)
-    while True:
-        vm.virtnet.free_mac_address(0)
+    # generate_mac_address() frees the current mac by itself
+    new_mac = vm.virtnet.generate_mac_address(0)
+    while new_mac == old_mac:
         new_mac = vm.virtnet.generate_mac_address(0)
-        if old_mac != new_mac:
-            break
-
-    os_type = params.get("os_type")
-    change_cmd_pattern = params.get("change_cmd")
 
     logging.info("The initial MAC address is %s", old_mac)
     if os_type == "linux":
         interface = utils_net.get_linux_ifname(session_serial, old_mac)
     else:
-        connection_id = utils_net.get_windows_nic_attribute(session,
-                                                             "macaddress",
-                                                             old_mac,
-                                                             "netconnectionid")
-        nic_index = utils_net.get_windows_nic_attribute(session,
-                                                         "netconnectionid",
-                                                         connection_id,
-                                                         "index")
+        nic_attrs = _get_nic_attrs(session_serial, old_mac,
+                                   ["netconnectionid", "index"])
+        connection_id = nic_attrs["netconnectionid"]
+        nic_index = nic_attrs["index"]
 
     # Start change MAC address
     error.context("Changing MAC address to %s" % new_mac, logging.info)
     if os_type == "linux":
-        change_cmd = change_cmd_pattern % (interface,
-                                           interface, new_mac, interface)
+        change_cmd = change_cmd_pattern.format(iface=interface, mac=new_mac)
     else:
         change_cmd = change_cmd_pattern % (int(nic_index),
-                                           "".join(new_mac.split(":")))
+                                           new_mac.replace(":", ""))
+    # This session will be used to assess whether the IP change worked,
+    # it has to be opened before the change but nothing else needs it.
+    session = vm.wait_for_login(timeout=timeout)
     try:
         session_serial.cmd(change_cmd)
 
@@ -59,7 +86,13 @@ def run_mac_change(test, params, env):
         error.context("Verify the new mac address, and restart the network",
                       logging.info)
         if os_type == "linux":
-            session_serial.cmd("ifconfig | grep -i %s" % new_mac)
+            status, output = session_serial.cmd_status_output(
+                                        "ip -o link show dev %s" % interface)
+            if status != 0:
+                # Old guests may not ship the ip tool
+                output = session_serial.cmd("ifconfig %s" % interface)
+            if new_mac.lower() not in output.lower():
+                raise error.TestFail("Guest mac change failed")
             logging.info("Mac address change successfully, net restart...")
             dhclient_cmd = "dhclient -r && dhclient %s" % interface
             session_serial.sendline(dhclient_cmd)
@@ -68,12 +101,17 @@ def run_mac_change(test, params, env):
                                                     connection_id)
 
             o = session_serial.cmd("ipconfig /all")
-            if not re.findall("%s" % "-".join(new_mac.split(":")), o, re.I):
+            mac_dash = new_mac.replace(":", "-")
+            # Don't match inside a longer run of hex digits
+            mac_re = re.compile(r"(?<![0-9A-Fa-f-])%s(?![0-9A-Fa-f-])"
+                                % re.escape(mac_dash), re.I)
+            if mac_re.search(o) is None:
                 raise error.TestFail("Guest mac change failed")
             logging.info("Guest mac have been modified successfully")
 
         # Re-log into the guest after changing mac address
-        if utils_misc.wait_for(session.is_responsive, 120, 20, 3):
+        if not utils_misc.wait_for(lambda: not session.is_responsive(),
+                                   120, 5, 1):
             # Just warning when failed to see the session become dead,
             # because there is a little chance the ip does not change.
             logging.warn("The session is still responsive, settings may fail.")
@@ -86,7 +124,6 @@ def run_mac_change(test, params, env):
             raise error.TestFail("The new session is not responsive.")
     finally:
         if os_type == "windows":
-            clean_cmd_pattern = params.get("clean_cmd")
             clean_cmd = clean_cmd_pattern % int(nic_index)
             session_serial.cmd(clean_cmd)
             utils_net.restart_windows_guest_network(session_serial,
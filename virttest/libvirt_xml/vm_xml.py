@@ -209,6 +209,17 @@ class VMXML(VMXMLBase):
         self.virsh.define(self.xml)
 
 
+    def redefine(self):
+        """
+        Replace persistent definition of this VM with XML from this instance
+
+        libvirt replaces an existing definition with matching name and uuid,
+        so no undefine is needed.  Running VMs pick up changes on next start.
+        """
+        # Allow any exceptions to propigate up
+        self.define()
+
+
     @staticmethod
     def vm_rename(vm, new_name, uuid=None, virsh_instance=base.virsh):
         """
@@ -222,7 +233,8 @@ class VMXML(VMXMLBase):
         if vm.is_alive():
             vm.destroy(gracefully=True)
         vmxml = VMXML.new_from_dumpxml(vm_name=vm.name, virsh_instance=virsh_instance)
-        backup = vmxml.copy()
+        # Only needed on failure, keep text instead of a parsed copy
+        backup_xml = str(vmxml)
         # can't do in-place rename, must operate on XML
         try:
             vmxml.undefine()
@@ -247,7 +259,10 @@ class VMXML(VMXMLBase):
         except error.CmdError, detail:
             del vmxml # clean up temporary files
             # Allow exceptions thrown here since state will be undefined
-            backup.define()
+            backup = xml_utils.TempXMLFile()
+            backup.write(backup_xml)
+            backup.flush()
+            virsh_instance.define(backup.name)
             raise xcepts.LibvirtXMLError("Error reported while defining VM:\n%s"
                                    % detail)
         # Keep names uniform
@@ -268,23 +283,21 @@ class VMXML(VMXMLBase):
             vmxml['vcpu'] = value # call accessor method to change XML
         else: # value == None
             del vmxml.vcpu
-        vmxml.undefine()
-        vmxml.define()
+        vmxml.redefine()
         # Temporary files for vmxml cleaned up automatically
         # when it goes out of scope here.
 
 
     def get_disk_all(self):
         """
-        Return VM's disk from XML definition, None if not set
+        Return VM's disk from XML definition, empty dict if not set
         """
         xmltreefile = self.dict_get('xml')
-        disk_nodes = xmltreefile.find('devices').findall('disk')
-        disks = {}
-        for node in disk_nodes:
-            dev = node.find('target').get('dev')
-            disks[dev] = node
-        return disks
+        devices = xmltreefile.find('devices')
+        if devices is None:
+            return {}
+        return dict((disk.find('target').get('dev'), disk)
+                    for disk in devices.findall('disk'))
 
 
     @staticmethod
@@ -295,10 +308,7 @@ class VMXML(VMXMLBase):
         @param: vm_name: Name of defined vm.
         """
         vmxml = VMXML.new_from_dumpxml(vm_name)
-        disks = vmxml.get_disk_all()
-        if disks != None:
-            return disks.keys()
-        return None
+        return vmxml.get_disk_all().keys()
 
 
     @staticmethod
@@ -308,30 +318,26 @@ class VMXML(VMXMLBase):
 
         @param: vm_name: Name of defined vm.
         """
-        vmxml = VMXML.new_from_dumpxml(vm_name)
-        disks = vmxml.get_disk_all()
-        if disks != None:
-            return len(disks)
-        return 0
+        return len(VMXML.get_disk_blk(vm_name))
 
 
     # ToDo: Convert into numa property (needs nested-dict accessorgenerator)
-    def get_numa_params(self, vm_name):
+    def get_numa_params(self):
         """
         Return VM's numa setting from XML definition
         """
-        vmxml = VMXML.new_from_dumpxml(vm_name)
-        xmltreefile = vmxml.dict_get('xml')
+        xmltreefile = self.dict_get('xml')
         numa_params = {}
-        try:
-            numa = xmltreefile.find('numatune')
-            try:
-                numa_params['mode'] = numa.find('memory').get('mode')
-                numa_params['nodeset'] = numa.find('memory').get('nodeset')
-            except TypeError:
-                logging.error("Can't find <memory> element")
-        except TypeError:
+        numa = xmltreefile.find('numatune')
+        if numa is None:
             logging.error("Can't find <numatune> element")
+            return numa_params
+        memory = numa.find('memory')
+        if memory is None:
+            logging.error("Can't find <memory> element")
+            return numa_params
+        numa_params['mode'] = memory.get('mode')
+        numa_params['nodeset'] = memory.get('nodeset')
         return numa_params
 
 
@@ -340,16 +346,21 @@ class VMXML(VMXMLBase):
         Get a dict with primary serial features.
         """
         xmltreefile = self.dict_get('xml')
-        primary_serial = xmltreefile.find('devices').find('serial')
-        serial_features = {}
-        serial_type = primary_serial.get('type')
-        serial_port = primary_serial.find('target').get('port')
-        # Support node here for more features
-        serial_features['serial'] = primary_serial
-        # Necessary features
-        serial_features['type'] = serial_type
-        serial_features['port'] = serial_port
-        return serial_features
+        devices = xmltreefile.find('devices')
+        if devices is None:
+            raise xcepts.LibvirtXMLNotFoundError("Can't find <devices> element")
+        primary_serial = devices.find('serial')
+        if primary_serial is None:
+            raise xcepts.LibvirtXMLNotFoundError("Can't find <serial> element")
+        target = primary_serial.find('target')
+        if target is not None:
+            serial_port = target.get('port')
+        else:
+            serial_port = None
+        # Support node here for more features, others are necessary features
+        return {'serial': primary_serial,
+                'type': primary_serial.get('type'),
+                'port': serial_port}
 
 
     @staticmethod
@@ -367,12 +378,13 @@ class VMXML(VMXMLBase):
         xmltreefile = vmxml.dict_get('xml')
         try:
             serial = vmxml.get_primary_serial()['serial']
-        except AttributeError:
+        except xcepts.LibvirtXMLNotFoundError:
             logging.debug("Can not find any serial, now create one.")
             # Create serial tree, default is pty
             serial = xml_utils.ElementTree.SubElement(
                                 xmltreefile.find('devices'),
                                 'serial', {'type': 'pty'})
+        if serial.find('target') is None:
             # Create elements of serial target, default port is 0
             xml_utils.ElementTree.SubElement(serial, 'target', {'port': '0'})
 
@@ -387,10 +399,9 @@ class VMXML(VMXMLBase):
                 serial.remove(source)
             except AssertionError:
                 pass # Element not found, already removed.
+        # define() reads the written file, the tree is already loaded in vmxml
         xmltreefile.write()
-        vmxml.set_xml(xmltreefile.name)
-        vmxml.undefine()
-        vmxml.define()
+        vmxml.redefine()
 
 
     def get_iface_all(self):
@@ -238,6 +238,39 @@ class TestVMXML(LibvirtXMLTestBase):
         self.assertEqual(vmxml.hypervisor_type, 'kvm')
 
 
+    def test_get_disk_all(self):
+        vmxml = vm_xml.VMXML.new_from_dumpxml('foobar', self.dummy_virsh)
+        self.assertEqual(vmxml.get_disk_all(), {})
+        disk = xml_utils.ElementTree.SubElement(
+                                vmxml.xmltreefile.find('devices'), 'disk')
+        xml_utils.ElementTree.SubElement(disk, 'target', {'dev': 'vda'})
+        self.assertEqual(vmxml.get_disk_all().keys(), ['vda'])
+        vmxml = vm_xml.VMXML('kvm', self.dummy_virsh)
+        self.assertEqual(vmxml.get_disk_all(), {})
+
+
+    def test_get_primary_serial(self):
+        vmxml = vm_xml.VMXML.new_from_dumpxml('foobar', self.dummy_virsh)
+        serial = vmxml.get_primary_serial()
+        self.assertEqual(serial['type'], 'pty')
+        self.assertEqual(serial['port'], '0')
+        self.assertEqual(serial['serial'].tag, 'serial')
+        vmxml = vm_xml.VMXML('kvm', self.dummy_virsh)
+        self.assertRaises(xcepts.LibvirtXMLNotFoundError,
+                          vmxml.get_primary_serial)
+
+
+    def test_get_numa_params(self):
+        vmxml = vm_xml.VMXML.new_from_dumpxml('foobar', self.dummy_virsh)
+        self.assertEqual(vmxml.get_numa_params(), {})
+        numa = xml_utils.ElementTree.SubElement(vmxml.xmltreefile.getroot(),
+                                                'numatune')
+        xml_utils.ElementTree.SubElement(numa, 'memory',
+                                         {'mode': 'strict', 'nodeset': '0'})
+        self.assertEqual(vmxml.get_numa_params(),
+                         {'mode': 'strict', 'nodeset': '0'})
+
+
 class testNetworkXML(LibvirtXMLTestBase):
 
     def _from_scratch(self):
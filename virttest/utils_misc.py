@@ -597,16 +597,32 @@ def kvm_flags_to_stresstests(flags):
     return param
 
 
+_cpu_flags = None
+
+
 def get_cpu_flags():
     """
     Returns a list of the CPU flags
+
+    Host flags can't change while running, /proc/cpuinfo is only read once.
     """
-    flags_re = re.compile(r'^flags\s*:(.*)')
-    for line in open('/proc/cpuinfo').readlines():
-        match = flags_re.match(line)
-        if match:
-            return match.groups()[0].split()
-    return []
+    global _cpu_flags
+    if _cpu_flags is None:
+        cpu_flags = []
+        flags_re = re.compile(r'^flags\s*:(.*)')
+        cpuinfo = open('/proc/cpuinfo')
+        try:
+            for line in cpuinfo:
+                match = flags_re.match(line)
+                if match:
+                    cpu_flags = match.groups()[0].split()
+                    break
+        finally:
+            cpuinfo.close()
+        # Only cache after a successful read
+        _cpu_flags = cpu_flags
+    # Callers may modify the returned list
+    return list(_cpu_flags)
 
 
 def get_cpu_vendor(cpu_flags=[], verbose=True):
@@ -1,6 +1,6 @@
 #!/usr/bin/python
 
-import unittest
+import unittest, StringIO
 import common
 from autotest.client import utils
 from autotest.client.shared.test_utils import mock
@@ -96,6 +96,46 @@ git_repo_foo_commit = bc732ad8b2ed8be52160b893735417b43a1e91a8
         self.assertEqual(n6, "1048576.0")
 
 
+class TestCpuFlags(unittest.TestCase):
+    def setUp(self):
+        self.opened = []
+        utils_misc._cpu_flags = None
+
+
+    def tearDown(self):
+        utils_misc._cpu_flags = None
+        if hasattr(utils_misc, 'open'):
+            del utils_misc.open
+
+
+    def fake_open(self, filename):
+        self.opened.append(filename)
+        return StringIO.StringIO("processor\t: 0\n"
+                                 "flags\t\t: fpu vme sse2\n")
+
+
+    def broken_open(self, filename):
+        raise IOError("Can't read %s" % filename)
+
+
+    def test_get_cpu_flags_cached(self):
+        utils_misc.open = self.fake_open
+        flags = utils_misc.get_cpu_flags()
+        self.assertEqual(flags, ['fpu', 'vme', 'sse2'])
+        # Returned list is a copy, modifying it must not touch the cache
+        flags.append('foo')
+        self.assertEqual(utils_misc.get_cpu_flags(), ['fpu', 'vme', 'sse2'])
+        self.assertEqual(self.opened, ['/proc/cpuinfo'])
+
+
+    def test_get_cpu_flags_read_error(self):
+        utils_misc.open = self.broken_open
+        self.assertRaises(IOError, utils_misc.get_cpu_flags)
+        # Failure must not be cached as an empty flag list
+        utils_misc.open = self.fake_open
+        self.assertEqual(utils_misc.get_cpu_flags(), ['fpu', 'vme', 'sse2'])
+
+
 class FakeCmd(object):
     def __init__(self, cmd):
         self.fake_cmds = [